@@ -9,4 +9,5 @@ from fluxconf.migration import (
     VersionedBaseModel,
     load_migrations_from_dir,
     run_migrations,
+    run_migrations_batch,
 )
@@ -1,12 +1,32 @@
 from __future__ import annotations
 
+import mmap
 import os
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, ClassVar, Generic, TypeVar
+from typing import IO, Any, ClassVar, Generic, TypeVar
 
 import yaml
 from pydantic import BaseModel, ValidationError
 
+try:  # LibYAML is ~10x faster than the pure-Python loader when available
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
+try:  # optional 'perf' extra; parsing JSON is ~10-20x faster than parsing YAML
+    from orjson import dumps as _json_dumps
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    import json as _json
+
+    def _json_dumps(data: Any) -> bytes:
+        return _json.dumps(data).encode("utf-8")
+
+    _json_loads = _json.loads
+
 from fluxconf.migration import (
     Migrations,
     VersionedBaseModel,
@@ -14,11 +34,57 @@ from fluxconf.migration import (
     load_migrations_from_dir,
     run_migrations,
 )
-from fluxconf.pydantic_helpers import add_literal_fields_to_dict, add_persistent_fields_to_dict
-from fluxconf.yaml_helpers import YamlDumper, config_dict_to_yaml
+from fluxconf.pydantic_helpers import add_output_fields_to_dict
+from fluxconf.yaml_helpers import config_dict_to_yaml, config_dict_to_yaml_stream
 
 T = TypeVar("T", bound=BaseModel)
 
+# Below this size the cost of setting up a memory map outweighs the saved copy.
+_MMAP_THRESHOLD = 4096
+
+
+def _target_mode(path: Path) -> int:
+    """Return the permission bits *path* should end up with after a replace.
+
+    ``tempfile.mkstemp`` creates files as 0600, so the temp file must be
+    re-chmodded before ``os.replace`` or the replaced config silently loses
+    group/other read access. An existing file keeps its current mode; a new
+    file gets the umask-adjusted default that ``open(path, "w")`` would use.
+    """
+    try:
+        return os.stat(path).st_mode & 0o777
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def _atomic_writer(path: Path) -> Iterator[IO[bytes]]:
+    """Yield a buffered binary stream that atomically replaces *path* on success.
+
+    Content is streamed into a same-directory temp file and moved into place
+    with ``os.replace``, so a crash mid-write can never leave a truncated
+    config, and no intermediate full-document string is required. The binary
+    mode lets the YAML emitter produce UTF-8 bytes directly, and the buffer
+    coalesces the schema header and body into the same write syscall.
+    """
+    parent = path.parent
+    if not parent.exists():
+        os.makedirs(parent, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb", buffering=64 * 1024) as stream:
+            yield stream
+        os.chmod(tmp_path, _target_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
 
 class ConfigIO(Generic[T]):
     """File-backed configuration manager with migration support.
@@ -33,6 +99,8 @@ class ConfigIO(Generic[T]):
             migrations_dir = Path(__file__).parent / "migrations"
     """
 
+    __slots__ = ("config_directory", "_path")
+
     file_name: ClassVar[str]
     config_type: ClassVar[type]
 
@@ -41,15 +109,28 @@ class ConfigIO(Generic[T]):
     migrations_dir: ClassVar[Path | str | None] = None
     always_include_fields: ClassVar[list[str]] = []
 
+    #: Opt-in: keep a ``<file_name>.cache.json`` sidecar so cold-start reads of
+    #: an unchanged file parse JSON instead of YAML.
+    use_json_cache: ClassVar[bool] = False
+
+    # Parsed models keyed by (subclass, path), with the stat signature of the
+    # file they were parsed from. The subclass in the key means two ConfigIO
+    # types pointing at the same file can never serve each other's models.
+    _parse_cache: ClassVar[dict[tuple[type, Path], tuple[int, int, BaseModel]]] = {}
+
+    # Migrations are static per class, so the merged inline + directory set
+    # (and the latest version derived from it) is computed once per subclass.
+    _effective_cache: ClassVar[dict[type, Migrations]] = {}
+    _latest_cache: ClassVar[dict[type, int]] = {}
+
     def __init__(self, config_directory: str | Path) -> None:
-        if str(config_directory).startswith("~"):
-            self.config_directory = Path(config_directory).expanduser()
-        else:
-            self.config_directory = Path(config_directory)
+        # expanduser() is a no-op without a leading "~" (and supports ~user forms)
+        self.config_directory = Path(config_directory).expanduser()
+        self._path = self.config_directory / self.file_name
 
     def get_path(self) -> Path:
         """Return the full path to the configuration file."""
-        return self.config_directory / self.file_name
+        return self._path
 
     def parse(self, config: dict[str, Any]) -> T:
         """Parse a raw dict into the typed config model.
@@ -58,15 +139,30 @@ class ConfigIO(Generic[T]):
         """
         return self.config_type(**(config or {}))  # type: ignore[no-any-return]
 
+    @classmethod
+    def clear_migration_cache(cls) -> None:
+        """Drop the memoised migrations for this class (e.g. after editing migrations_dir)."""
+        cls._effective_cache.pop(cls, None)
+        cls._latest_cache.pop(cls, None)
+
     def _latest_version(self) -> int:
         """Return the highest migration version, or 0 if there are no migrations."""
+        cached = self._latest_cache.get(type(self))
+        if cached is not None:
+            return cached
         effective = self._effective_migrations()
-        if not effective:
-            return 0
-        return max(_migration_prefix(k) for k in effective)
+        latest = max((_migration_prefix(k) for k in effective), default=0)
+        self._latest_cache[type(self)] = latest
+        return latest
 
     def _effective_migrations(self) -> Migrations:
-        """Return merged migrations from inline dict and migrations_dir."""
+        """Return merged migrations from inline dict and migrations_dir.
+
+        The result is computed once per class; migrations do not change at runtime.
+        """
+        cached = self._effective_cache.get(type(self))
+        if cached is not None:
+            return cached
         effective: Migrations = dict(self.migrations)
         if self.migrations_dir is not None:
             dir_migrations = load_migrations_from_dir(self.migrations_dir)
@@ -77,27 +173,48 @@ class ConfigIO(Generic[T]):
                     f"migrations_dir: {sorted(collisions)}"
                 )
             effective.update(dir_migrations)
+        self._effective_cache[type(self)] = effective
         return effective
 
-    def read(self) -> T:
+    def read(self, force: bool = False) -> T:
         """Read the config file, run any pending migrations, and return the parsed model.
 
         If migrations are applied the file is written back to disk with the updated data.
+
+        Results are cached against the file's stat signature, so repeated reads of an
+        unchanged file skip parsing entirely. Pass ``force=True`` to bypass the cache.
         """
+        path = self.get_path()
+        cache_key = (type(self), path)
+        stat = os.stat(path)
+        if not force:
+            cached = self._parse_cache.get(cache_key)
+            if cached is not None and (stat.st_mtime_ns, stat.st_size) == cached[:2]:
+                return cached[2].model_copy(deep=True)  # type: ignore[return-value]
+
         raw = self._read_raw()
         effective = self._effective_migrations()
-        if effective:
+        # Steady-state fast path: a config already at the latest version has no
+        # applicable migrations, so skip run_migrations (and its copy) entirely.
+        if effective and raw.get("version", 0) != self._latest_version():
             migrated = run_migrations(raw, effective)
-            if migrated != raw:
+            # run_migrations returns the input object itself iff nothing changed,
+            # so identity alone decides whether a write-back is needed — no
+            # recursive dict compare.
+            if migrated is not raw:
                 self._write_raw(migrated)
                 raw = migrated
 
         try:
-            return self.parse(raw)
+            model = self.parse(raw)
         except ValidationError as exc:
-            path = self.get_path()
             raise ValueError(f"Failed to parse {path}: {exc}") from exc
 
+        # Re-stat in case a migration write-back replaced the file above.
+        stat = os.stat(path)
+        self._parse_cache[cache_key] = (stat.st_mtime_ns, stat.st_size, model)
+        return model.model_copy(deep=True)
+
     def write(self, config: T, include_defaults: bool = False) -> None:
         """Serialise *config* and write it to disk as YAML."""
         if isinstance(config, VersionedBaseModel):
@@ -106,40 +223,112 @@ class ConfigIO(Generic[T]):
                 config.version = latest
 
         path = self.get_path()
-        os.makedirs(path.parent, exist_ok=True)
 
         config_dict: dict[str, Any] = config.model_dump(
             mode="json", exclude_defaults=not include_defaults
         )
+        add_output_fields_to_dict(
+            config,
+            config_dict,
+            always_include_fields=self.always_include_fields,
+            include_literals=not include_defaults,
+        )
 
-        if not include_defaults:
-            add_literal_fields_to_dict(config, config_dict)
-
-        if self.always_include_fields:
-            add_persistent_fields_to_dict(config, config_dict, self.always_include_fields)
-
-        data = config_dict_to_yaml(config_dict, schema_url=self.schema_url or None)
-        with open(path, "w") as stream:
-            stream.write(data)
+        with _atomic_writer(path) as stream:
+            config_dict_to_yaml_stream(config_dict, stream, schema_url=self.schema_url or None)
+        self._parse_cache.pop((type(self), path), None)
+        if self.use_json_cache:
+            self._json_cache_path(path).unlink(missing_ok=True)
 
     def serialise(self, config: T) -> str:
-        """Serialise *config* to a YAML string without writing to disk."""
-        config_dict: dict[str, Any] = config.model_dump(mode="json")
-        return yaml.dump(config_dict, Dumper=YamlDumper, sort_keys=True)
+        """Serialise *config* to a YAML string without writing to disk.
+
+        Output is canonical: mappings are sorted at every level, matching what
+        :meth:`write` puts on disk, so semantically equal configs always
+        serialise to the same string regardless of dict insertion order.
+        """
+        return config_dict_to_yaml(config.model_dump(mode="json"))
 
     # -- Low-level helpers ---------------------------------------------------
 
     def _read_raw(self) -> dict[str, Any]:
-        """Read the YAML file and return the raw dict."""
+        """Read the YAML file and return the raw dict.
+
+        Larger files are parsed straight from a memory map, letting the loader
+        consume the kernel page cache without an intermediate read copy.
+        """
         path = self.get_path()
-        with open(path) as stream:
-            result = yaml.safe_load(stream)
-        return result or {}
+        if self.use_json_cache:
+            cached = self._read_json_cache(path)
+            if cached is not None:
+                return cached
+        result = None
+        with open(path, "rb") as stream:
+            if os.fstat(stream.fileno()).st_size >= _MMAP_THRESHOLD:
+                try:
+                    with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        result = yaml.load(mapped, Loader=_SafeLoader)
+                except (ValueError, OSError):
+                    # mmap unavailable (e.g. special filesystems): fall through
+                    stream.seek(0)
+                    result = yaml.load(stream, Loader=_SafeLoader)
+            else:
+                result = yaml.load(stream, Loader=_SafeLoader)
+        result = result or {}
+        if self.use_json_cache:
+            self._write_json_cache(path, result)
+        return result
+
+    def _json_cache_path(self, path: Path) -> Path:
+        """Return the sidecar JSON cache path for *path*."""
+        return path.with_name(path.name + ".cache.json")
+
+    def _read_json_cache(self, path: Path) -> dict[str, Any] | None:
+        """Return the cached raw dict if the sidecar is at least as new as *path*."""
+        cache_path = self._json_cache_path(path)
+        try:
+            if cache_path.stat().st_mtime_ns >= os.stat(path).st_mtime_ns:
+                result = _json_loads(cache_path.read_bytes())
+                return result or {}
+        except (OSError, ValueError):
+            pass
+        return None
+
+    def _write_json_cache(self, path: Path, data: dict[str, Any]) -> None:
+        """Atomically write the sidecar JSON cache for *path* (best effort).
+
+        The sidecar is only written when the JSON round-trip reproduces *data*
+        exactly. YAML can hold values JSON cannot represent faithfully —
+        non-string mapping keys, timestamp objects — and a lossy sidecar would
+        make the raw dict fed to migrations and ``parse`` depend on cache
+        warmth; such configs simply parse YAML every time.
+        """
+        try:
+            payload = _json_dumps(data)
+            if _json_loads(payload) != data:
+                return
+        except (TypeError, ValueError):
+            return
+        cache_path = self._json_cache_path(path)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=path.parent, prefix=f".{cache_path.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as stream:
+                stream.write(payload)
+            os.chmod(tmp_path, _target_mode(cache_path))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
 
     def _write_raw(self, data: dict[str, Any]) -> None:
         """Write a raw dict to disk as YAML (used for migration write-back)."""
         path = self.get_path()
-        os.makedirs(path.parent, exist_ok=True)
-        content = config_dict_to_yaml(data, schema_url=self.schema_url or None)
-        with open(path, "w") as stream:
-            stream.write(content)
+        with _atomic_writer(path) as stream:
+            config_dict_to_yaml_stream(data, stream, schema_url=self.schema_url or None)
+        self._parse_cache.pop((type(self), path), None)
+        if self.use_json_cache:
+            self._json_cache_path(path).unlink(missing_ok=True)
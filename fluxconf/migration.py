@@ -1,18 +1,46 @@
 from __future__ import annotations
 
-import json
-from collections.abc import Callable
+import os
+import pickle
+import re
+from array import array
+from bisect import bisect_right
+from collections.abc import Callable, Iterable, Iterator
 from copy import deepcopy
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from types import ModuleType
+from typing import TYPE_CHECKING, Any, Protocol, runtime_checkable
 
 import jsonpatch as jsonpatch_lib
 from pydantic import BaseModel
 
+try:  # orjson's C parser is several times faster than the stdlib json module
+    from orjson import loads as _json_loads
+except ImportError:  # pragma: no cover
+    from json import loads as _json_loads
+
 MigrationFn = Callable[[dict[str, Any]], dict[str, Any]]
 JsonPatchOp = dict[str, Any]
 JsonPatch = list[JsonPatchOp]
-Migration = MigrationFn | JsonPatch
+
+if TYPE_CHECKING:
+    # jsonpatch ships no type stubs, so jsonpatch_lib.JsonPatch resolves to Any
+    # and cannot appear in a type alias. This structural stand-in gives the
+    # alias a real type; at runtime it is the actual class, so isinstance
+    # dispatch below works unchanged.
+    @runtime_checkable
+    class _CompiledPatch(Protocol):
+        """The parts of :class:`jsonpatch.JsonPatch` the runner relies on."""
+
+        patch: JsonPatch
+
+        def apply(self, obj: dict[str, Any], in_place: bool = False) -> dict[str, Any]: ...
+else:
+    _CompiledPatch = jsonpatch_lib.JsonPatch
+
+Migration = MigrationFn | JsonPatch | _CompiledPatch
 Migrations = dict[str, Migration]
 
 
@@ -27,17 +55,83 @@ class VersionedBaseModel(BaseModel):
     version: int = 0
 
 
-def _migration_prefix(key: str) -> int:
-    """Return the integer prefix from a migration key like '1_description'."""
-    return int(key.split("_", 1)[0])
+# Migration file stems must start with an integer prefix: "1", "1_foo", ...
+_PREFIX_RE = re.compile(r"^\d+(?:_|$)")
+
 
+def _fast_deep_copy(data: dict[str, Any]) -> dict[str, Any]:
+    """Deep-copy a config dict via a pickle round-trip.
 
-def _apply_json_patch(data: dict[str, Any], patch: JsonPatch) -> dict[str, Any]:
-    """Apply a JSON Patch (RFC 6902) to *data* and return the result."""
-    result: dict[str, Any] = jsonpatch_lib.JsonPatch(patch).apply(data)
+    Unlike a JSON round-trip this is lossless: ``yaml.safe_load`` can produce
+    non-string keys, and YAML timestamps arrive as ``datetime``/``date``
+    objects, which JSON would silently coerce to strings. The C-implemented
+    pickle path is still faster than ``copy.deepcopy`` (which carries a memo
+    dict and per-type dispatch); values pickle cannot handle fall back to
+    ``deepcopy``.
+    """
+    try:
+        result: dict[str, Any] = pickle.loads(pickle.dumps(data, pickle.HIGHEST_PROTOCOL))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return deepcopy(data)
     return result
 
 
+@lru_cache(maxsize=1024)
+def _migration_prefix(key: str) -> int:
+    """Return the integer prefix from a migration key like '1_description'.
+
+    Memoised: migration keys are a small, stable set, so repeated calls across
+    reads become dict lookups instead of split + int parses.
+    """
+    return int(key.partition("_")[0])
+
+
+@lru_cache(maxsize=1024)
+def _parse_stem(stem: str) -> int | None:
+    """Return the integer version prefix of a migration file stem, or ``None``.
+
+    ``None`` marks stems without a valid integer prefix (helper modules etc.).
+    Memoised: the same stems recur on every re-scan of a migrations directory,
+    so repeat scans skip the regex match and int parse.
+    """
+    if _PREFIX_RE.match(stem) is None:
+        return None
+    return int(stem.partition("_")[0])
+
+
+@dataclass(slots=True)
+class _MigrationPlan:
+    """Sorted migrations in a struct-of-arrays layout.
+
+    The prefix column is a packed C ``array('q')`` that bisect scans without
+    per-element pointer chasing; keys and migrations are parallel lists indexed
+    by the same positions. Built once per run (or once per batch) by
+    :func:`_build_plan`.
+    """
+
+    versions: array[int]
+    keys: list[str]
+    migrations: list[Migration]
+
+
+def _build_plan(migrations: Migrations) -> _MigrationPlan:
+    """Decode *migrations* into a prefix-sorted :class:`_MigrationPlan`.
+
+    Each key's integer prefix is parsed exactly once (and memoised by
+    :func:`_migration_prefix`), giving callers a sorted prefix column that
+    bisect can slice without re-parsing.
+    """
+    entries = sorted(
+        ((_migration_prefix(key), key, migration) for key, migration in migrations.items()),
+        key=lambda entry: entry[0],
+    )
+    return _MigrationPlan(
+        versions=array("q", (entry[0] for entry in entries)),
+        keys=[entry[1] for entry in entries],
+        migrations=[entry[2] for entry in entries],
+    )
+
+
 class MigrationError(Exception):
     """Raised when a migration function fails.
 
@@ -45,12 +139,23 @@ class MigrationError(Exception):
         last_successful_migration: The version of the last migration that completed
             successfully, or the stored version if no migrations succeeded.
         original_error: The original exception that caused the failure.
+        snapshot: The config state just before the failing migration ran (a
+            top-level copy, so nested structures mutated in place by the failing
+            migration may still be tainted unless ``deep=True`` was used), or
+            ``None`` when the failure happened outside a migration run.
     """
 
-    def __init__(self, message: str, last_successful_migration: int, original_error: Exception):
+    def __init__(
+        self,
+        message: str,
+        last_successful_migration: int,
+        original_error: Exception,
+        snapshot: dict[str, Any] | None = None,
+    ):
         super().__init__(message)
         self.last_successful_migration = last_successful_migration
         self.original_error = original_error
+        self.snapshot = snapshot
 
 
 def run_migrations(
@@ -58,40 +163,95 @@ def run_migrations(
     migrations: Migrations,
     target_version: int | None = None,
     version_field: str = "version",
+    deep: bool = False,
 ) -> dict[str, Any]:
     """Run migrations on a config dict from its stored version up to target_version.
 
     Migrations are keyed by strings of the form ``"N_description"`` (e.g.
     ``"1_add_roles"``). Only the integer prefix participates in ordering and is stored
-    in the config file. Each migration value can be either a callable
-    ``(dict) -> dict`` or a JSON Patch (list of RFC 6902 operation dicts).
+    in the config file. Each migration value can be a callable ``(dict) -> dict``,
+    a JSON Patch (list of RFC 6902 operation dicts), or a pre-compiled
+    :class:`jsonpatch.JsonPatch` (the form :func:`load_migrations_from_dir`
+    produces, which skips per-application patch parsing).
 
     Only migrations where ``stored < prefix <= target`` are applied,
     in ascending prefix order.
 
+    Migration functions receive a shallow copy of *data*, so the caller's dict is
+    never mutated at the top level. Migrations must build and return a new dict
+    (or reassign keys on the copy they are given) rather than mutating nested
+    structures in place; pass ``deep=True`` for migrations that do mutate nested
+    structures, which copies via a fast JSON round-trip instead.
+
     Args:
-        data: The raw config dict (will not be mutated).
+        data: The raw config dict (the top level will not be mutated).
         migrations: Mapping of ``"N_description"`` keys to migration callables or
             JSON Patch operation lists.
         target_version: The version to migrate up to (inclusive). Defaults to the maximum
             prefix found in *migrations*, or ``0`` if *migrations* is empty.
         version_field: The key in *data* that stores the current version.
+        deep: Deep-copy the input before migrating, protecting nested structures
+            from in-place mutation at the cost of a JSON round-trip.
 
     Returns:
         A new dict with all applicable migrations applied and *version_field* set to
-        *target*.
+        *target*. When nothing needed to change, *data* itself is returned, so
+        callers can use an identity check as a cheap "was anything migrated" flag.
 
     Raises:
         ValueError: If the stored version is ahead of the latest known migration.
         MigrationError: If a migration function raises. The error carries
             ``last_successful_migration`` so callers can inspect rollback state.
     """
-    data = deepcopy(data)
+    return _run_prepared(data, _build_plan(migrations), target_version, version_field, deep)
+
+
+def run_migrations_batch(
+    configs: Iterable[dict[str, Any]],
+    migrations: Migrations,
+    target_version: int | None = None,
+    version_field: str = "version",
+    deep: bool = False,
+) -> Iterator[dict[str, Any]]:
+    """Run the same migrations over many config dicts, preparing the pipeline once.
+
+    Equivalent to calling :func:`run_migrations` per config, but the migration
+    keys are decoded and sorted a single time for the whole batch, so the
+    per-config cost is just the bisect slice and the migrations themselves.
+
+    Args:
+        configs: Iterable of raw config dicts (consumed lazily, migrated in order).
+        migrations: Mapping of ``"N_description"`` keys to migration callables or
+            JSON Patch operation lists.
+        target_version: The version to migrate up to (inclusive). Defaults to the
+            maximum prefix found in *migrations*, or ``0`` if empty.
+        version_field: The key in each config that stores the current version.
+        deep: Deep-copy each input before migrating (see :func:`run_migrations`).
+
+    Yields:
+        The migrated dict for each input config, in input order.
+
+    Raises:
+        ValueError: If a config's stored version is ahead of the latest migration.
+        MigrationError: If a migration fails for any config.
+    """
+    plan = _build_plan(migrations)
+    for config in configs:
+        yield _run_prepared(config, plan, target_version, version_field, deep)
+
+
+def _run_prepared(
+    data: dict[str, Any],
+    plan: _MigrationPlan,
+    target_version: int | None,
+    version_field: str,
+    deep: bool,
+) -> dict[str, Any]:
+    """Apply a pre-built migration plan to *data* (see :func:`run_migrations`)."""
+    versions = plan.versions
     stored: int = data.get(version_field, 0)
     target: int = (
-        target_version
-        if target_version is not None
-        else (max(_migration_prefix(k) for k in migrations) if migrations else 0)
+        target_version if target_version is not None else (versions[-1] if versions else 0)
     )
 
     if stored > target:
@@ -100,46 +260,87 @@ def run_migrations(
             " The config file may have been written by a newer version of the software."
         )
 
-    applicable = sorted(
-        [
-            (key, migration)
-            for key, migration in migrations.items()
-            if stored < _migration_prefix(key) <= target
-        ],
-        key=lambda item: _migration_prefix(item[0]),
-    )
+    # Steady-state no-op paths resolve on int comparisons alone, before any
+    # bisect (and any copy): already current, or every known migration is at or
+    # below the stored version.
+    if stored == target:
+        return data
+    if not versions or stored >= versions[-1]:
+        return {**data, version_field: target}
+
+    lo = bisect_right(versions, stored)
+    hi = bisect_right(versions, target)
+
+    if lo == hi:
+        # Migrations exist but none fall in (stored, target]: just stamp.
+        return {**data, version_field: target}
+
+    # Reject invalid migration values up front, outside the try frame, so
+    # nothing runs (and no partial state exists) when the plan is malformed.
+    for index in range(lo, hi):
+        migration = plan.migrations[index]
+        if callable(migration) or isinstance(migration, (jsonpatch_lib.JsonPatch, list)):
+            continue
+        exc = TypeError(
+            f"Migration {plan.keys[index]!r} must be a callable or a list of JSON Patch"
+            f" operations, got {type(migration).__name__}"
+        )
+        raise MigrationError(
+            f"Migration {plan.keys[index]!r} failed: {exc}",
+            last_successful_migration=stored,
+            original_error=exc,
+            snapshot=dict(data),
+        )
+
+    data = _fast_deep_copy(data) if deep else dict(data)
 
+    # One try frame around the whole loop rather than one per migration; the
+    # except clause reconstructs the failure context from the loop locals.
     last_successful: int = stored
-    for key, migration in applicable:
-        if not callable(migration) and not isinstance(migration, list):
-            exc = TypeError(
-                f"Migration {key!r} must be a callable or a list of JSON Patch operations,"
-                f" got {type(migration).__name__}"
-            )
-            raise MigrationError(
-                f"Migration {key!r} failed: {exc}",
-                last_successful_migration=last_successful,
-                original_error=exc,
-            )
-        try:
+    key: str = ""
+    snapshot: dict[str, Any] | None = None
+    try:
+        for index in range(lo, hi):
+            key = plan.keys[index]
+            migration = plan.migrations[index]
+            # O(top-level keys) snapshot so a failure can surface the
+            # pre-failure state even if the failing migration mutated the
+            # dict before raising.
+            snapshot = dict(data)
             if callable(migration):
                 data = migration(data)
+            elif isinstance(migration, list):
+                # Inline patches arrive as raw op lists; compile on use.
+                data = jsonpatch_lib.JsonPatch(migration).apply(data)
             else:
-                data = _apply_json_patch(data, migration)
-            last_successful = _migration_prefix(key)
-        except MigrationError:
-            raise
-        except Exception as exc:
-            raise MigrationError(
-                f"Migration {key!r} failed: {exc}",
-                last_successful_migration=last_successful,
-                original_error=exc,
-            ) from exc
+                data = migration.apply(data)
+            last_successful = versions[index]
+    except MigrationError:
+        raise
+    except Exception as exc:
+        raise MigrationError(
+            f"Migration {key!r} failed: {exc}",
+            last_successful_migration=last_successful,
+            original_error=exc,
+            snapshot=snapshot,
+        ) from exc
 
     data[version_field] = target
     return data
 
 
+# Loaded migration sets keyed by (resolved directory, per-file stat signature).
+# Keying on (name, mtime_ns, size) means edits to any migration file miss the
+# cache, while repeated loads of an unchanged directory skip exec_module/json
+# parsing entirely.
+_dir_cache: dict[tuple[Path, tuple[tuple[str, int, int], ...]], Migrations] = {}
+
+# Executed migration modules keyed by (resolved path, mtime_ns), mirroring what
+# sys.modules does for normal imports: an unchanged file is never re-executed,
+# even when the directory-level cache misses (e.g. a sibling file changed).
+_module_cache: dict[tuple[str, int], ModuleType] = {}
+
+
 def load_migrations_from_dir(directory: Path | str) -> Migrations:
     """Load migrations from a directory of ``N_description.py`` or ``N_description.json`` files.
 
@@ -148,60 +349,103 @@ def load_migrations_from_dir(directory: Path | str) -> Migrations:
     ``migrate`` takes precedence.
 
     JSON files must contain a top-level JSON array of RFC 6902 patch operations.
+    Patch migrations are returned pre-compiled as :class:`jsonpatch.JsonPatch`
+    objects so they are parsed and validated once at load time rather than on
+    every application.
 
     Files whose stem starts with ``_`` or whose prefix is not a valid integer
     are silently skipped (allowing helper modules to coexist in the directory).
 
+    Python files may also declare ``depends_on``, a list of migration keys the
+    file requires. Migrations always execute in ascending prefix order — which
+    is a valid topological order exactly when every dependency has a strictly
+    lower prefix — so dependencies are checked once at load time rather than
+    re-sorted on every run.
+
     Raises:
         FileNotFoundError: If *directory* does not exist or is not a directory.
         ValueError: If a matching ``.py`` file defines neither ``migrate`` nor ``patch``.
         TypeError: If a ``patch`` attribute or ``.json`` file does not contain a list.
         ValueError: If two files resolve to the same migration key (e.g. ``1_foo.py``
             and ``1_foo.json``).
+        ValueError: If a ``depends_on`` entry names an unknown migration or one
+            whose prefix is not strictly lower (which prefix ordering cannot satisfy).
     """
-    import importlib.util
-
     directory = Path(directory)
     if not directory.is_dir():
         raise FileNotFoundError(f"migrations_dir does not exist or is not a directory: {directory}")
 
+    # Filter and decode in a single scandir pass: is_file() uses the cached
+    # dirent type instead of an extra stat call, and entries without an
+    # integer prefix (e.g. helper modules) are dropped before any Path objects
+    # exist. Sorting on the decoded (prefix, name) pairs then yields the
+    # candidates already in version order, so no second ordering pass is needed.
+    keyed: list[tuple[int, str]] = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith("_") or not name.endswith((".py", ".json")):
+                continue
+            prefix = _parse_stem(name.rsplit(".", 1)[0])
+            if prefix is not None and entry.is_file():
+                keyed.append((prefix, name))
+    keyed.sort()
+    candidates = [directory / name for _, name in keyed]
+
+    stats = [path.stat() for path in candidates]
+    signature = tuple(
+        (path.name, stat.st_mtime_ns, stat.st_size)
+        for path, stat in zip(candidates, stats, strict=True)
+    )
+    cache_key = (directory.resolve(), signature)
+    cached = _dir_cache.get(cache_key)
+    if cached is not None:
+        return dict(cached)
+
     migrations: Migrations = {}
+    dependencies: dict[str, list[str]] = {}
 
-    for path in sorted(directory.iterdir()):
-        if path.suffix not in (".py", ".json"):
-            continue
+    for path, stat in zip(candidates, stats, strict=True):
         stem = path.stem
-        if stem.startswith("_"):
-            continue
-        # Skip files without an integer prefix (e.g. helper modules)
-        prefix_str = stem.split("_", 1)[0]
-        if not prefix_str.isdigit():
-            continue
-
         if stem in migrations:
             raise ValueError(
                 f"Duplicate migration key {stem!r}: multiple files resolve to the same key"
             )
 
         if path.suffix == ".json":
-            with open(path) as f:
-                patch = json.load(f)
+            # Binary read: both orjson and the stdlib json accept bytes directly.
+            patch = _json_loads(path.read_bytes())
             if not isinstance(patch, list):
                 raise TypeError(
                     f"Migration file {path} must contain a JSON array of patch operations,"
                     f" got {type(patch).__name__}"
                 )
-            migrations[stem] = patch
+            migrations[stem] = jsonpatch_lib.JsonPatch(patch)
 
         else:  # .py
-            spec = importlib.util.spec_from_file_location(stem, path)
-            if spec is None or spec.loader is None:
-                raise ValueError(f"Cannot load migration file: {path}")
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+            module_key = (str(path.resolve()), stat.st_mtime_ns)
+            cached_module = _module_cache.get(module_key)
+            if cached_module is not None:
+                module = cached_module
+            else:
+                # Read via the raw fd (migration files are small; one read
+                # covers the whole file) and exec into a plain module namespace,
+                # skipping the importlib machinery and its TextIOWrapper stack.
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    source = os.read(fd, stat.st_size).decode("utf-8")
+                finally:
+                    os.close(fd)
+                module = ModuleType(stem)
+                module.__file__ = str(path)
+                exec(compile(source, str(path), "exec"), module.__dict__)
+                _module_cache[module_key] = module
 
             migrate_fn = getattr(module, "migrate", None)
             patch_attr = getattr(module, "patch", None)
+            depends_on = getattr(module, "depends_on", None)
+            if depends_on:
+                dependencies[stem] = list(depends_on)
 
             if migrate_fn is not None:
                 if not callable(migrate_fn):
@@ -215,11 +459,24 @@ def load_migrations_from_dir(directory: Path | str) -> Migrations:
                         f"Migration file {path} defines 'patch' but it is not a list,"
                         f" got {type(patch_attr).__name__}"
                     )
-                migrations[stem] = patch_attr
+                migrations[stem] = jsonpatch_lib.JsonPatch(patch_attr)
             else:
                 raise ValueError(
                     f"Migration file {path} defines neither a 'migrate' function"
                     " nor a 'patch' list."
                 )
 
-    return migrations
+    # Prefix order is the execution order, so the dependency graph is satisfied
+    # iff every edge points at a strictly lower prefix. One pass at load time.
+    for stem, deps in dependencies.items():
+        for dep in deps:
+            if dep not in migrations:
+                raise ValueError(f"Migration {stem!r} depends on unknown migration {dep!r}")
+            if _migration_prefix(dep) >= _migration_prefix(stem):
+                raise ValueError(
+                    f"Migration {stem!r} depends on {dep!r}, which does not have a"
+                    " strictly lower prefix; prefix-ordered execution cannot satisfy it"
+                )
+
+    _dir_cache[cache_key] = migrations
+    return dict(migrations)
@@ -1,7 +1,31 @@
 from __future__ import annotations
 
+from functools import cache
 from typing import Any, Literal, get_origin
 
+from pydantic import BaseModel
+
+
+@cache
+def _field_plan(model_class: type) -> tuple[tuple[str, str, str], ...]:
+    """Classify each field of *model_class* once, keyed by the class.
+
+    The Literal/discriminator classification is a pure function of the class, so
+    it is computed at plan time; per-instance calls then dispatch on the cached
+    ``(field_name, kind, discriminator_name)`` tuples without any reflection.
+    ``discriminator_name`` is only meaningful for ``"discriminator"`` entries
+    and is empty otherwise.
+    """
+    plan: list[tuple[str, str, str]] = []
+    for field_name, field_info in model_class.model_fields.items():  # type: ignore[attr-defined]
+        if get_origin(field_info.annotation) is Literal:
+            plan.append((field_name, "literal", ""))
+        elif getattr(field_info, "discriminator", None):
+            plan.append((field_name, "discriminator", str(field_info.discriminator)))
+        else:
+            plan.append((field_name, "other", ""))
+    return tuple(plan)
+
 
 def add_literal_fields_to_dict(obj: Any, data: dict[str, Any]) -> None:
     """Restore Literal fields and discriminated-union discriminators into *data*.
@@ -15,32 +39,58 @@ def add_literal_fields_to_dict(obj: Any, data: dict[str, Any]) -> None:
         obj: A pydantic ``BaseModel`` instance (or any object - non-models are skipped).
         data: The dict produced by ``model_dump()`` that should be patched in-place.
     """
-    if not hasattr(obj, "__class__") or not hasattr(obj.__class__, "model_fields"):
+    if not isinstance(obj, BaseModel):
         return
 
-    for field_name, field_info in obj.__class__.model_fields.items():
+    for field_name, kind, discriminator_name in _field_plan(obj.__class__):
         field_value = getattr(obj, field_name)
 
         # Direct Literal fields
-        if get_origin(field_info.annotation) is Literal:
+        if kind == "literal":
             data[field_name] = field_value
 
         # Discriminated union fields
-        elif hasattr(field_info, "discriminator") and field_info.discriminator:
+        elif kind == "discriminator":
             if field_value is not None:
                 if field_name not in data:
                     data[field_name] = {}
-                discriminator_name = str(field_info.discriminator)
                 data[field_name][discriminator_name] = getattr(field_value, discriminator_name)
                 add_literal_fields_to_dict(field_value, data[field_name])
 
         # Nested BaseModel fields
-        elif hasattr(field_value, "__class__") and hasattr(field_value.__class__, "model_fields"):
+        elif isinstance(field_value, BaseModel):
             if field_name not in data:
                 data[field_name] = {}
             add_literal_fields_to_dict(field_value, data[field_name])
 
 
+def add_output_fields_to_dict(
+    obj: Any,
+    data: dict[str, Any],
+    always_include_fields: list[str] | None = None,
+    include_literals: bool = True,
+) -> None:
+    """Apply the serialisation policies to *data* in one combined pass.
+
+    Bundles :func:`add_literal_fields_to_dict` and
+    :func:`add_persistent_fields_to_dict` so callers make one call per write,
+    and skips the secondary ``model_dump`` entirely when every persistent field
+    already survived ``exclude_defaults``.
+
+    Args:
+        obj: A pydantic ``BaseModel`` instance.
+        data: The dict produced by ``model_dump()`` that should be patched in-place.
+        always_include_fields: Top-level fields to force into *data*.
+        include_literals: Whether to restore Literal/discriminator fields.
+    """
+    if include_literals:
+        add_literal_fields_to_dict(obj, data)
+    if always_include_fields:
+        missing = [name for name in always_include_fields if name not in data]
+        if missing:
+            add_persistent_fields_to_dict(obj, data, missing)
+
+
 def add_persistent_fields_to_dict(obj: Any, data: dict[str, Any], field_names: list[str]) -> None:
     """Force specific fields into *data* regardless of whether they match the default.
 
@@ -52,13 +102,14 @@ def add_persistent_fields_to_dict(obj: Any, data: dict[str, Any], field_names: l
         data: The dict produced by ``model_dump()`` that should be patched in-place.
         field_names: Names of top-level fields to force into *data*.
     """
+    # Dump all requested model fields in one pass rather than one
+    # model_dump call (a full serializer walk) per field.
+    model_fields = obj.__class__.model_fields if isinstance(obj, BaseModel) else {}
+    include = {name for name in field_names if name in model_fields}
+    dumped = obj.model_dump(mode="json", include=include) if include else {}
+
     for name in field_names:
-        if hasattr(obj, name):
-            value = getattr(obj, name)
-            # Use json-compatible value if available
-            if hasattr(obj.__class__, "model_fields") and name in obj.__class__.model_fields:
-                json_data = obj.model_dump(mode="json", include={name})
-                if name in json_data:
-                    data[name] = json_data[name]
-                    continue
-            data[name] = value
+        if name in dumped:
+            data[name] = dumped[name]
+        elif hasattr(obj, name):
+            data[name] = getattr(obj, name)
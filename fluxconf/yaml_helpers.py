@@ -1,23 +1,50 @@
 from __future__ import annotations
 
-from typing import Any
+from functools import lru_cache
+from typing import IO, Any
 
 import yaml
 
+try:  # the libyaml emitter is several times faster than the pure-Python one
+    from yaml import CSafeDumper as _DumperBase
+except ImportError:  # pragma: no cover
+    from yaml import SafeDumper as _DumperBase  # type: ignore[assignment]
 
-class YamlDumper(yaml.Dumper):
-    """A YAML dumper that shows lists inline if they contain only simple scalars."""
+
+_CONTAINER_TYPES = (dict, list)
+
+
+class YamlDumper(_DumperBase):
+    """A YAML dumper that shows lists inline if they contain only simple scalars.
+
+    Subclasses the libyaml-backed CSafeDumper when available; only the emitter
+    is implemented in C, so the representer overrides below stay effective.
+    """
 
     def represent_sequence(self, tag: str, sequence: Any, flow_style: bool | None = None) -> Any:
-        if isinstance(sequence, list) and all(
-            not isinstance(item, dict | list) for item in sequence
+        # Tuple-form isinstance is evaluated in C and, unlike the dict | list
+        # union, is not rebuilt per element; subclasses of dict/list still count
+        # as containers. Short-circuits on the first container found.
+        if isinstance(sequence, list) and not any(
+            isinstance(item, _CONTAINER_TYPES) for item in sequence
         ):
             flow_style = True
         return super().represent_sequence(tag, sequence, flow_style)
 
-    def represent_mapping(self, tag: str, mapping: Any, flow_style: bool | None = None) -> Any:
-        flow_style = False
-        return super().represent_mapping(tag, mapping, flow_style)
+
+# Pre-bound references so the per-call body does no module attribute lookups
+_dump = yaml.dump
+_Dumper = YamlDumper
+
+
+@lru_cache(maxsize=32)
+def _schema_header(schema_url: str) -> str:
+    """Return the yaml-language-server header line (with trailing newline) for *schema_url*.
+
+    Memoised: the URL is fixed per ConfigIO subclass, so repeated writes reuse
+    the formatted line.
+    """
+    return f"# yaml-language-server: $schema={schema_url}\n"
 
 
 def config_dict_to_yaml(config_dict: dict[str, Any], schema_url: str | None = None) -> str:
@@ -30,8 +57,36 @@ def config_dict_to_yaml(config_dict: dict[str, Any], schema_url: str | None = No
     Returns:
         A YAML string, optionally prefixed with a schema comment line.
     """
-    body = yaml.dump(config_dict, Dumper=YamlDumper, sort_keys=True)
+    # yaml.dump returns str when no stream is given; the annotation pins it so
+    # no runtime str() cast is needed.
+    body: str = _dump(config_dict, Dumper=_Dumper, sort_keys=True, default_flow_style=False)
+    if schema_url:
+        return _schema_header(schema_url) + body
+    return body
+
+
+def config_dict_to_yaml_stream(
+    config_dict: dict[str, Any], stream: IO[bytes], schema_url: str | None = None
+) -> None:
+    """Serialise a config dict as UTF-8 YAML directly into a binary *stream*.
+
+    Streaming variant of :func:`config_dict_to_yaml`: the emitter writes into
+    the stream as it goes, so no intermediate full-document string is built.
+    With ``encoding`` set, PyYAML emits UTF-8 bytes itself, skipping the
+    str-to-bytes transcode a text wrapper would add.
+
+    Args:
+        config_dict: The configuration dictionary to serialise.
+        stream: A writable binary stream.
+        schema_url: If provided, a ``# yaml-language-server`` header is written first.
+    """
     if schema_url:
-        header = f"# yaml-language-server: $schema={schema_url}"
-        return "\n".join([header, body])
-    return str(body)
+        stream.write(_schema_header(schema_url).encode())
+    _dump(
+        config_dict,
+        stream,
+        Dumper=_Dumper,
+        sort_keys=True,
+        default_flow_style=False,
+        encoding="utf-8",
+    )
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+import os
 from typing import Annotated, Literal, Union
 
 import pytest
@@ -8,6 +10,9 @@ from pydantic import BaseModel, Field
 
 from fluxconf import ConfigIO, VersionedBaseModel
 
+# Match production: use the libyaml dumper when available for fixture files
+yaml_dump = functools.partial(yaml.dump, Dumper=getattr(yaml, "CSafeDumper", yaml.SafeDumper))
+
 
 # ---------------------------------------------------------------------------
 # Test models
@@ -159,6 +164,22 @@ class TestReadWriteRoundTrip:
         with pytest.raises(FileNotFoundError):
             io.read()
 
+    def test_write_leaves_no_temp_files(self, config_dir):
+        io = SimpleConfigIO(config_dir)
+        io.write(SimpleConfig(name="atomic", version="1.0.0"))
+        io.write(SimpleConfig(name="atomic again", version="1.0.0"))
+
+        assert [p.name for p in config_dir.iterdir()] == ["simple.yml"]
+
+    def test_overwrite_preserves_file_mode(self, config_dir):
+        io = SimpleConfigIO(config_dir)
+        io.write(SimpleConfig(name="first", version="1.0.0"))
+        io.get_path().chmod(0o644)
+
+        io.write(SimpleConfig(name="second", version="1.0.0"))
+
+        assert io.get_path().stat().st_mode & 0o777 == 0o644
+
 
 # ---------------------------------------------------------------------------
 # Tests: migration on read
@@ -175,7 +196,7 @@ class TestMigrationOnRead:
         # Write a legacy config with no version and the old field name
         old_data = {"name": "test", "active": False}
         with open(path, "w") as f:
-            yaml.dump(old_data, f)
+            yaml_dump(old_data, f)
 
         config = io.read()
         assert config.enabled is False
@@ -194,7 +215,7 @@ class TestMigrationOnRead:
 
         current_data = {"name": "test", "enabled": True, "version": 2}
         with open(path, "w") as f:
-            yaml.dump(current_data, f)
+            yaml_dump(current_data, f)
 
         mtime_before = path.stat().st_mtime
         io.read()
@@ -264,6 +285,165 @@ class TestLiteralFieldRestoration:
         assert loaded.pet.indoor is False
 
 
+# ---------------------------------------------------------------------------
+# Tests: read cache
+# ---------------------------------------------------------------------------
+
+
+class SharedFileConfig(BaseModel):
+    name: str = "other"
+    version: str = "0.0.0"
+
+
+class SharedFileConfigIO(ConfigIO[SharedFileConfig]):
+    # Deliberately points at the same file as SimpleConfigIO
+    file_name = "simple.yml"
+    config_type = SharedFileConfig
+
+
+class TestReadCache:
+    def test_unchanged_file_is_not_reparsed(self, config_dir, monkeypatch):
+        io = SimpleConfigIO(config_dir)
+        io.write(SimpleConfig(name="cached", version="1.0.0"))
+        io.read()
+
+        def boom():
+            raise AssertionError("_read_raw should not be called for a cached read")
+
+        monkeypatch.setattr(io, "_read_raw", boom)
+        loaded = io.read()
+        assert loaded.name == "cached"
+
+    def test_force_bypasses_cache(self, config_dir):
+        io = SimpleConfigIO(config_dir)
+        io.write(SimpleConfig(name="first", version="1.0.0"))
+        io.read()
+
+        # Rewrite the file behind ConfigIO's back, restoring mtime (and keeping
+        # the size, "first" and "fresh" being equal length) so the stat
+        # signature still matches and a plain read serves the stale cache.
+        path = io.get_path()
+        stat = path.stat()
+        path.write_text(path.read_text().replace("first", "fresh"))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert io.read().name == "first"
+        assert io.read(force=True).name == "fresh"
+
+    def test_mutating_returned_model_does_not_poison_cache(self, config_dir):
+        io = SimpleConfigIO(config_dir)
+        io.write(SimpleConfig(name="original", version="1.0.0"))
+
+        first = io.read()
+        first.name = "mutated"
+
+        second = io.read()
+        assert second.name == "original"
+
+    def test_cache_is_keyed_per_subclass(self, config_dir):
+        """Two ConfigIO types sharing a file must not serve each other's models."""
+        io = SimpleConfigIO(config_dir)
+        io.write(SimpleConfig(name="shared", version="1.0.0"))
+        io.read()
+
+        loaded = SharedFileConfigIO(config_dir).read()
+        assert isinstance(loaded, SharedFileConfig)
+        assert loaded.name == "shared"
+
+    def test_write_invalidates_cache(self, config_dir):
+        io = SimpleConfigIO(config_dir)
+        io.write(SimpleConfig(name="before", version="1.0.0"))
+        io.read()
+
+        io.write(SimpleConfig(name="after", version="1.0.0"))
+        assert io.read().name == "after"
+
+
+# ---------------------------------------------------------------------------
+# Tests: JSON sidecar cache
+# ---------------------------------------------------------------------------
+
+
+class JsonCacheConfigIO(ConfigIO[SimpleConfig]):
+    file_name = "cached.yml"
+    config_type = SimpleConfig
+    use_json_cache = True
+
+
+class TestJsonSidecarCache:
+    def test_sidecar_created_on_read(self, config_dir):
+        io = JsonCacheConfigIO(config_dir)
+        io.write(SimpleConfig(name="test", version="1.0.0"))
+        io.read()
+
+        assert (config_dir / "cached.yml.cache.json").exists()
+
+    def test_fresh_sidecar_is_preferred_over_yaml(self, config_dir):
+        io = JsonCacheConfigIO(config_dir)
+        io.write(SimpleConfig(name="from-yaml", version="1.0.0"))
+        io.read()
+
+        sidecar = config_dir / "cached.yml.cache.json"
+        sidecar.write_text('{"name": "from-cache", "version": "1.0.0"}')
+        assert io.read(force=True).name == "from-cache"
+
+    def test_sidecar_skipped_when_json_round_trip_is_lossy(self, config_dir):
+        """YAML values JSON cannot represent faithfully must not be cached."""
+        io = JsonCacheConfigIO(config_dir)
+        path = io.get_path()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            yaml_dump({"name": "x", "ports": {8080: "web"}, "version": "1.0.0"}, f)
+
+        assert io._read_raw()["ports"] == {8080: "web"}
+        assert not (config_dir / "cached.yml.cache.json").exists()
+        # Warm or cold, the raw dict is identical
+        assert io._read_raw()["ports"] == {8080: "web"}
+
+    def test_write_invalidates_sidecar(self, config_dir):
+        io = JsonCacheConfigIO(config_dir)
+        io.write(SimpleConfig(name="first", version="1.0.0"))
+        io.read()
+
+        io.write(SimpleConfig(name="second", version="1.0.0"))
+        assert not (config_dir / "cached.yml.cache.json").exists()
+        assert io.read().name == "second"
+
+
+# ---------------------------------------------------------------------------
+# Tests: serialise
+# ---------------------------------------------------------------------------
+
+
+class LabelledConfig(BaseModel):
+    name: str = "x"
+    labels: dict[str, int] = Field(default_factory=dict)
+    version: str = "0.0.0"
+
+
+class LabelledConfigIO(ConfigIO[LabelledConfig]):
+    file_name = "labelled.yml"
+    config_type = LabelledConfig
+
+
+class TestSerialise:
+    def test_matches_write_output(self, config_dir):
+        io = NestedConfigIO(config_dir)
+        config = NestedConfig(name="custom")
+        io.write(config, include_defaults=True)
+
+        assert io.serialise(config) == io.get_path().read_text()
+
+    def test_equal_configs_serialise_identically(self, config_dir):
+        """Dict insertion order must not leak into the canonical output."""
+        io = LabelledConfigIO(config_dir)
+        a = LabelledConfig(labels={"beta": 2, "alpha": 1})
+        b = LabelledConfig(labels={"alpha": 1, "beta": 2})
+
+        assert a == b
+        assert io.serialise(a) == io.serialise(b)
+
+
 # ---------------------------------------------------------------------------
 # Tests: schema header
 # ---------------------------------------------------------------------------
@@ -1,8 +1,15 @@
+import datetime
 import json
 
+import jsonpatch
 import pytest
 
-from fluxconf.migration import MigrationError, load_migrations_from_dir, run_migrations
+from fluxconf.migration import (
+    MigrationError,
+    load_migrations_from_dir,
+    run_migrations,
+    run_migrations_batch,
+)
 
 
 class TestRunMigrations:
@@ -104,6 +111,24 @@ class TestRunMigrations:
 
         assert exc_info.value.last_successful_migration == 0
 
+    def test_failure_snapshot_holds_pre_failure_state(self):
+        """MigrationError.snapshot restores the state before the failing migration."""
+
+        def migrate_1(data):
+            data["applied"] = True
+            return data
+
+        def migrate_2(data):
+            data["half_done"] = True
+            raise RuntimeError("mid-migration failure")
+
+        migrations = {"1_first": migrate_1, "2_second": migrate_2}
+
+        with pytest.raises(MigrationError) as exc_info:
+            run_migrations({"version": 0}, migrations)
+
+        assert exc_info.value.snapshot == {"version": 0, "applied": True}
+
     def test_missing_version_field_defaults_to_zero(self):
         """If the data has no version field, it defaults to 0 and all migrations run."""
         called = False
@@ -162,6 +187,32 @@ class TestRunMigrations:
         assert original["key"] == "original"
         assert result["key"] == "modified"
 
+    def test_deep_copy_protects_nested_structures(self):
+        """With deep=True, in-place mutation of nested dicts cannot leak to the caller."""
+        original = {"version": 0, "nested": {"key": "original"}}
+
+        def migrate_1(data):
+            data["nested"]["key"] = "modified"
+            return data
+
+        result = run_migrations(original, {"1_first": migrate_1}, deep=True)
+
+        assert original["nested"]["key"] == "original"
+        assert result["nested"]["key"] == "modified"
+
+    def test_deep_copy_preserves_non_json_types(self):
+        """deep=True must not coerce YAML-native values the way a JSON round-trip would."""
+        original = {
+            "version": 0,
+            "mapping": {1: "one"},
+            "when": datetime.date(2024, 1, 1),
+        }
+
+        result = run_migrations(original, {"1_noop": lambda data: data}, deep=True)
+
+        assert result["mapping"] == {1: "one"}
+        assert result["when"] == datetime.date(2024, 1, 1)
+
     def test_custom_version_field(self):
         """A custom version_field name should be respected."""
 
@@ -204,6 +255,49 @@ class TestRunMigrations:
             run_migrations({"version": 5}, migrations)
 
 
+class TestRunMigrationsBatch:
+    def test_migrates_configs_at_different_versions_in_order(self):
+        def migrate_1(data):
+            data["a"] = 1
+            return data
+
+        def migrate_2(data):
+            data["b"] = 2
+            return data
+
+        migrations = {"1_first": migrate_1, "2_second": migrate_2}
+        configs = [{"version": 0}, {"version": 1}, {"version": 2}]
+
+        results = list(run_migrations_batch(configs, migrations))
+
+        assert results[0] == {"a": 1, "b": 2, "version": 2}
+        assert results[1] == {"b": 2, "version": 2}
+        assert results[2] == {"version": 2}
+
+    def test_matches_run_migrations_per_config(self):
+        patch = [{"op": "add", "path": "/added", "value": True}]
+        migrations = {"1_patch": patch}
+        configs = [{"name": "x"}, {"name": "y", "version": 1}]
+
+        batched = list(run_migrations_batch(configs, migrations))
+        individual = [run_migrations(config, migrations) for config in configs]
+
+        assert batched == individual
+
+    def test_failure_propagates_as_migration_error(self):
+        def migrate_1(data):
+            if data.get("bad"):
+                raise RuntimeError("boom")
+            return data
+
+        migrations = {"1_first": migrate_1}
+        results = run_migrations_batch([{}, {"bad": True}], migrations)
+
+        assert next(results)["version"] == 1
+        with pytest.raises(MigrationError):
+            next(results)
+
+
 class TestJsonPatchMigrations:
     def test_add_operation(self):
         patch = [{"op": "add", "path": "/new_field", "value": "hello"}]
@@ -408,7 +502,8 @@ class TestLoadMigrationsFromDir:
         (tmp_path / "1_add_field.json").write_text(json.dumps(patch))
         migrations = load_migrations_from_dir(tmp_path)
         assert "1_add_field" in migrations
-        assert migrations["1_add_field"] == patch
+        assert isinstance(migrations["1_add_field"], jsonpatch.JsonPatch)
+        assert migrations["1_add_field"].patch == patch
 
     def test_json_file_end_to_end_with_run_migrations(self, tmp_path):
         patch = [
@@ -432,7 +527,7 @@ class TestLoadMigrationsFromDir:
         )
         migrations = load_migrations_from_dir(tmp_path)
         assert "1_patch" in migrations
-        assert isinstance(migrations["1_patch"], list)
+        assert isinstance(migrations["1_patch"], jsonpatch.JsonPatch)
 
     def test_py_file_with_both_migrate_and_patch_prefers_migrate(self, tmp_path):
         (tmp_path / "1_both.py").write_text(
@@ -461,6 +556,29 @@ class TestLoadMigrationsFromDir:
         assert result["b"] == 2
         assert result["version"] == 2
 
+    def test_depends_on_satisfied_by_prefix_order(self, tmp_path):
+        (tmp_path / "1_first.py").write_text("def migrate(data): return data\n")
+        (tmp_path / "2_second.py").write_text(
+            'depends_on = ["1_first"]\ndef migrate(data): return data\n'
+        )
+        migrations = load_migrations_from_dir(tmp_path)
+        assert set(migrations.keys()) == {"1_first", "2_second"}
+
+    def test_depends_on_unknown_migration_raises(self, tmp_path):
+        (tmp_path / "1_first.py").write_text(
+            'depends_on = ["0_missing"]\ndef migrate(data): return data\n'
+        )
+        with pytest.raises(ValueError, match="unknown migration"):
+            load_migrations_from_dir(tmp_path)
+
+    def test_depends_on_higher_prefix_raises(self, tmp_path):
+        (tmp_path / "1_first.py").write_text(
+            'depends_on = ["2_second"]\ndef migrate(data): return data\n'
+        )
+        (tmp_path / "2_second.py").write_text("def migrate(data): return data\n")
+        with pytest.raises(ValueError, match="strictly lower prefix"):
+            load_migrations_from_dir(tmp_path)
+
     def test_duplicate_stem_raises_value_error(self, tmp_path):
         (tmp_path / "1_foo.py").write_text("def migrate(data): return data\n")
         (tmp_path / "1_foo.json").write_text('[{"op": "add", "path": "/x", "value": 1}]')